@@ -0,0 +1,51 @@
+import math
+
+_HALF_DEG_TO_RAD = 0.0087266462599716  # pi / 360
+
+
+def _euler_xyz_deg_to_rotvec(x, y, z):
+    """
+    Convert one set of extrinsic xyz Euler angles (degrees) to an axis-angle rotation vector.
+
+    Works on plain floats with math.sin/cos; for the handful of joints in a frame this is far
+    cheaper than dispatching NumPy ufuncs over tiny arrays.
+    """
+    hx = x * _HALF_DEG_TO_RAD
+    hy = y * _HALF_DEG_TO_RAD
+    hz = z * _HALF_DEG_TO_RAD
+    cx, sx = math.cos(hx), math.sin(hx)
+    cy, sy = math.cos(hy), math.sin(hy)
+    cz, sz = math.cos(hz), math.sin(hz)
+
+    # q = q_z * q_y * q_x (extrinsic xyz: x is applied first)
+    cycz, sysz, cysz, sycz = cy * cz, sy * sz, cy * sz, sy * cz
+    qw = cx * cycz + sx * sysz
+    qx = sx * cycz - cx * sysz
+    qy = cx * sycz + sx * cysz
+    qz = cx * cysz - sx * sycz
+
+    # Keep the rotation angle within [0, pi]
+    if qw < 0.0:
+        qw, qx, qy, qz = -qw, -qx, -qy, -qz
+
+    v_norm = math.sqrt(qx * qx + qy * qy + qz * qz)
+    theta = 2.0 * math.atan2(v_norm, qw)
+    if v_norm < 1e-8:
+        # Taylor expansion of theta / sin(theta / 2) around 0
+        scale = 2.0 * (1.0 + theta * theta / 24.0)
+    else:
+        scale = theta / v_norm
+
+    return (qx * scale, qy * scale, qz * scale)
+
+
+def euler_xyz_deg_to_rotvec(eulers):
+    """
+    Convert a batch of extrinsic xyz Euler angles (degrees) to axis-angle rotation vectors.
+
+    eulers is a sequence of (x, y, z) triples; returns a list of (rx, ry, rz) tuples, one per
+    triple. Matches scipy's Rotation.from_euler("xyz", eulers, degrees=True).as_rotvec().
+    Results stay as Python floats since filling an ndarray from them costs more than the
+    conversion itself at a frame's worth of joints.
+    """
+    return [_euler_xyz_deg_to_rotvec(x, y, z) for x, y, z in eulers]
@@ -1,11 +1,12 @@
 import torch
 import threading
+import numpy as np
 
 import open3d.visualization.gui as gui
-import scipy.spatial.transform.rotation as R
 from loguru import logger
 
 from utils.vis_tools import AppWindow
+from utils._rot_kernels import euler_xyz_deg_to_rotvec
 
 
 class SMPLStreamingVisualizer:
@@ -25,6 +26,18 @@ class SMPLStreamingVisualizer:
         self._stop_event = threading.Event()
         self._joint_index_map = self._build_joint_index_map()
 
+        # Resolved once so the per-frame path skips the nested dict lookups
+        self._pose_ref = AppWindow.POSE_PARAMS[self.body_model]
+        self._idx_map = self._joint_index_map["body_pose"]
+
+        # Persistent pose tensors, one per component, that streamed updates are written into in place
+        self._scratch_pose = {"body_pose": torch.zeros_like(self._pose_ref["body_pose"])}
+
+        # Latest-wins slot for updates that haven't been drawn yet: {component: (reset, {joint_idx: rotvec})}
+        self._pending = None
+        self._pending_lock = threading.Lock()
+        self._pending_flag = threading.Event()
+
     def _build_joint_index_map(self) -> dict:
         joint_index_map = {}
         joint_config = AppWindow.JOINT_NAMES.get(self.body_model, {})
@@ -32,22 +45,6 @@ class SMPLStreamingVisualizer:
             joint_index_map[component] = {name: idx for idx, name in enumerate(names)}
         return joint_index_map
 
-    def _normalize_angles(self, angles, joint_key):
-        if angles is None:
-            logger.warning(f"Skipping joint '{joint_key}': received no angles")
-            return None
-
-        try:
-            x, y, z = [float(v) for v in angles]
-        except (TypeError, ValueError):
-            logger.warning(
-                f"Skipping joint '{joint_key}': expected three numeric angles, got {angles}"
-            )
-            return None
-
-        axis_angle = R.Rotation.from_euler("xyz", [x, y, z], degrees=True).as_rotvec()
-        return torch.from_numpy(axis_angle)
-
     def update_body_pose(
         self, joint_angles_deg: dict, component: str = "body_pose", reset: bool = True
     ):
@@ -63,47 +60,99 @@ class SMPLStreamingVisualizer:
         if not isinstance(joint_angles_deg, dict):
             raise TypeError("joint_angles_deg must be a dict of {joint_key: [x, y, z]}")
 
-        if component not in AppWindow.POSE_PARAMS[self.body_model]:
-            raise ValueError(
-                f"Pose component '{component}' is not valid for {self.body_model}"
-            )
+        if component == "body_pose":
+            idx_map = self._idx_map
+        else:
+            if component not in self._pose_ref:
+                raise ValueError(
+                    f"Pose component '{component}' is not valid for {self.body_model}"
+                )
+
+            if component not in self._joint_index_map:
+                raise ValueError(f"No joint index map found for component '{component}'")
 
-        if component not in self._joint_index_map:
-            raise ValueError(f"No joint index map found for component '{component}'")
+            idx_map = self._joint_index_map[component]
 
-        prepared_updates = []
+        idx_map_get = idx_map.get
+        joint_idxs = []
+        eulers = []
         for joint_key, angles in joint_angles_deg.items():
-            joint_idx = self._joint_index_map[component].get(joint_key)
+            joint_idx = idx_map_get(joint_key)
             if joint_idx is None:
                 logger.warning(
                     f"Unknown joint '{joint_key}' for component '{component}'"
                 )
                 continue
 
-            axis_angle = self._normalize_angles(angles, joint_key)
-            if axis_angle is None:
+            if angles is None:
+                logger.warning(f"Skipping joint '{joint_key}': received no angles")
+                continue
+
+            try:
+                x, y, z = [float(v) for v in angles]
+            except (TypeError, ValueError):
+                logger.warning(
+                    f"Skipping joint '{joint_key}': expected three numeric angles, got {angles}"
+                )
                 continue
 
-            prepared_updates.append((joint_idx, axis_angle))
+            joint_idxs.append(joint_idx)
+            eulers.append((x, y, z))
 
-        if not prepared_updates:
+        if not joint_idxs:
             logger.warning("No valid joint updates to apply; skipping pose update")
             return
 
-        def _apply():
-            pose_tensor = AppWindow.POSE_PARAMS[self.body_model][component]
-            new_pose = torch.zeros_like(pose_tensor) if reset else pose_tensor.clone()
-
-            for joint_idx, axis_angle in prepared_updates:
-                new_pose[0, joint_idx] = axis_angle
+        prepared_updates = dict(zip(joint_idxs, euler_xyz_deg_to_rotvec(eulers)))
+
+        # Coalesce with any update the GUI thread hasn't drawn yet so a burst of
+        # network lines results in a single SMPL forward pass
+        with self._pending_lock:
+            if self._pending is None:
+                self._pending = {}
+            queued = self._pending.get(component)
+            if queued is not None and not reset:
+                # Keep the earlier joints (and its reset) and layer the new ones on top
+                queued_reset, queued_updates = queued
+                queued_updates.update(prepared_updates)
+                self._pending[component] = (queued_reset, queued_updates)
+            else:
+                self._pending[component] = (reset, prepared_updates)
+
+            if self._pending_flag.is_set():
+                return
+            self._pending_flag.set()
+
+        gui.Application.instance.post_to_main_thread(self.window.window, self._apply_pending)
+
+    def _apply_pending(self):
+        """Drain the pending slot on the GUI thread and refresh the body mesh."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, None
+            self._pending_flag.clear()
+
+        if not pending:
+            return
 
-            AppWindow.POSE_PARAMS[self.body_model][component] = new_pose
-            self.window.load_body_model(
-                self.window._body_model.selected_text,
-                gender=self.window._body_model_gender.selected_text,
+        for component, (reset, updates) in pending.items():
+            pose_tensor = self._pose_ref[component]
+            new_pose = self._scratch_pose.get(component)
+            if new_pose is None or new_pose.shape != pose_tensor.shape:
+                new_pose = torch.zeros_like(pose_tensor)
+                self._scratch_pose[component] = new_pose
+
+            if reset:
+                new_pose.zero_()
+            elif new_pose is not pose_tensor:
+                # The viewer (sliders, IK, reset) swapped in its own tensor since our last update
+                new_pose.copy_(pose_tensor)
+
+            idxs = np.fromiter(updates.keys(), dtype=np.int64, count=len(updates))
+            new_pose[0, torch.from_numpy(idxs)] = torch.tensor(
+                list(updates.values()), dtype=pose_tensor.dtype
             )
 
-        gui.Application.instance.post_to_main_thread(self.window.window, _apply)
+            self.window.update_pose(self.body_model, component, new_pose)
 
     def run(self):
         """Blocking run loop; closes when window is closed."""
@@ -624,6 +624,9 @@ class AppWindow:
         self._show_joint_labels = gui.Checkbox("Show joint labels")
         self._show_joint_labels.set_on_checked(self._on_show_joint_labels)
 
+        # Mesh currently in the scene, kept so pose-only updates can reuse its faces/colors
+        self._body_mesh = None
+
         self._on_body_model(AppWindow.BODY_MODEL_NAMES[0], 0)
         # self._on_body_pose_comp(list(AppWindow.POSE_PARAMS[AppWindow.BODY_MODEL_NAMES[0]].keys())[0], 0)
         self._body_model.set_on_selection_changed(self._on_body_model)
@@ -1502,6 +1505,7 @@ class AppWindow:
 
         self._scene.scene.add_geometry("__body_model__", mesh,
                                        self.settings.material)
+        self._body_mesh = mesh
         bounds = mesh.get_axis_aligned_bounding_box()
         if AppWindow.CAM_FIRST:
             self._scene.setup_camera(60, bounds, bounds.get_center())
@@ -1509,6 +1513,49 @@ class AppWindow:
         AppWindow.BODY_TRANSL = torch.tensor([[0, min_y, 0]])
         self._on_show_joints(self._show_joints.checked)
 
+    def update_pose(self, body_model, component, new_pose):
+        """
+        Swap in a new pose for body_model and, if it is the one on screen, refresh the mesh.
+
+        Only the forward pass and vertex positions are recomputed; the faces, colors and
+        preloaded model are reused, so this is much cheaper than load_body_model.
+        """
+        AppWindow.POSE_PARAMS[body_model][component] = new_pose
+        if body_model != self._body_model.selected_text:
+            return
+
+        gender = self._body_model_gender.selected_text
+
+        if self._body_mesh is None:
+            self.load_body_model(body_model, gender=gender)
+            return
+
+        model = AppWindow.PRELOADED_BODY_MODELS[f'{body_model.lower()}-{gender.lower()}']
+        input_params = {k: v.reshape(1, -1) for k, v in AppWindow.POSE_PARAMS[body_model].items()}
+
+        with torch.no_grad():
+            model_output = model(
+                betas=self._body_beta_tensor,
+                expression=self._body_exp_tensor,
+                **input_params,
+            )
+        verts = model_output.vertices[0].numpy()
+        AppWindow.JOINTS = model_output.joints[0].numpy()
+
+        mesh = self._body_mesh
+        mesh.vertices = o3d.utility.Vector3dVector(verts)
+        mesh.compute_vertex_normals()
+        min_y = -mesh.get_min_bound()[1]
+        mesh.translate([0, min_y, 0])
+        AppWindow.JOINTS += np.array([0, min_y, 0])
+
+        # Open3DScene has no in-place update for legacy meshes, so swap the geometry
+        self._scene.scene.remove_geometry("__body_model__")
+        self._scene.scene.add_geometry("__body_model__", mesh,
+                                       self.settings.material)
+        AppWindow.BODY_TRANSL = torch.tensor([[0, min_y, 0]])
+        self._on_show_joints(self._show_joints.checked)
+
     def load(self, path):
         # self._scene.scene.clear_geometry()
         # if self.settings.show_ground:
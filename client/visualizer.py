@@ -1,7 +1,11 @@
+import os
 import socket
+import sys
 import threading
 import time
+import warnings
 
+import numpy as np
 from loguru import logger
 
 from utils.smpl_straming_visualizer import SMPLStreamingVisualizer
@@ -9,33 +13,65 @@ from utils.smpl_straming_visualizer import SMPLStreamingVisualizer
 HOST = "127.0.0.1"
 PORT = 5001
 
+# Set ENABLE_WIRE_TRACE=1 to log every received frame (read once; too costly to leave on by default)
+_TRACE = bool(os.environ.get("ENABLE_WIRE_TRACE"))
+
+# Bytes requested per recv; comfortably holds a batch of frames
+_RECV_SIZE = 65536
+
 viz = SMPLStreamingVisualizer(width=1280, height=720)
 
 
-def _parse_angles(line: str):
+def _parse_angles(line: bytes):
     """
     Parse joints and angles from generalized format: t (time),jointKey:x:y:z[,jointKey:x:y:z...]
+    The line is raw ASCII bytes straight off the socket.
     Returns (t, joint_updates_dict).
     """
-    parts = line.split(",")
+    parts = line.split(b",")
     if len(parts) < 2:
         raise ValueError("Too few fields")
 
     t = float(parts[0])
 
-    updates = {}
+    # Keep only the joint keys in Python and hand every numeric field to NumPy in one go
+    joint_keys = []
+    numeric_fields = []
     for entry in parts[1:]:
-        tokens = entry.split(":")
-        if len(tokens) != 4:
+        joint_key, _, values = entry.partition(b":")
+        fields = values.split(b":")
+        if len(fields) != 3:
             # Skip malformed tokens to keep the stream alive
-            logger.info(f"Skipping malformed joint token: {entry!r}")
+            logger.info(f"Skipping malformed joint token: {entry.decode(errors='replace')!r}")
             continue
-        joint_key, x_str, y_str, z_str = tokens
-        try:
-            updates[joint_key] = [float(x_str), float(y_str), float(z_str)]
-        except ValueError:
-            logger.info(f"Non-numeric angles in token: {entry!r}")
+        if not all(f.strip() for f in fields):
+            # NumPy parses a blank field as -1.0 instead of failing, so catch it here
+            logger.info(f"Non-numeric angles in token: {entry.decode(errors='replace')!r}")
             continue
+        joint_keys.append(joint_key.decode("ascii", errors="replace"))
+        numeric_fields.append(values.replace(b":", b","))
+
+    try:
+        with warnings.catch_warnings():
+            # Older NumPy warns (newer raises) when a field isn't numeric; the fallback below
+            # handles that case
+            warnings.simplefilter("ignore", DeprecationWarning)
+            angles = np.fromstring(b",".join(numeric_fields), dtype=np.float64, sep=",")
+    except ValueError:
+        angles = None
+
+    if angles is not None and angles.size == 3 * len(joint_keys):
+        updates = dict(zip(joint_keys, angles.reshape(-1, 3).tolist()))
+    else:
+        # Some field wasn't numeric; fall back to per-token parsing to drop just those joints
+        updates = {}
+        for joint_key, values in zip(joint_keys, numeric_fields):
+            try:
+                updates[joint_key] = [float(v) for v in values.split(b",")]
+            except ValueError:
+                entry = f"{joint_key}:{values.replace(b',', b':').decode(errors='replace')}"
+                logger.info(f"Non-numeric angles in token: {entry!r}")
+                continue
 
     if not updates:
         raise ValueError("No valid joint updates parsed")
@@ -43,32 +79,54 @@ def _parse_angles(line: str):
     return t, updates
 
 
+def _handle_line(line: bytes):
+    line = line.strip()
+    if not line:
+        return
+
+    try:
+        t, joint_updates = _parse_angles(line)
+        viz.update_body_pose(joint_updates)
+        if _TRACE:
+            pretty_updates = "; ".join(
+                f"{k}: {v}" for k, v in joint_updates.items()
+            )
+            logger.debug(f"t={t:.3f}, joints=({pretty_updates})")
+    except ValueError as e:
+        logger.error(f"[visualizer]: {line.decode(errors='replace')} ({e})")
+
+
 def main():
     # Connect to the angle-streaming server and update the SMPL visualizer
     while True:
         try:
             with socket.create_connection((HOST, PORT)) as sock:
                 logger.info(f"Connected to {HOST}:{PORT}")
-
-                # Wrap the socket in a file-like object so we can read line by line
-                with sock.makefile("r", encoding="utf-8") as f:
-                    try:
-                        for line in f:
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            try:
-                                t, joint_updates = _parse_angles(line)
-                                viz.update_body_pose(joint_updates)
-                                pretty_updates = "; ".join(
-                                    f"{k}: {v}" for k, v in joint_updates.items()
-                                )
-                                logger.info(f"t={t:.3f}, joints=({pretty_updates})")
-                            except ValueError as e:
-                                logger.error(f"[visualizer]: {line} ({e})")
-                    except KeyboardInterrupt:
-                        logger.info("Interrupted by user; closing connection")
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+                # Read raw bytes and split on newlines ourselves; the stream is plain ASCII so
+                # there's nothing to decode
+                buf = bytearray()
+                chunk = bytearray(_RECV_SIZE)
+                chunk_view = memoryview(chunk)
+                try:
+                    while True:
+                        n = sock.recv_into(chunk)
+                        if n == 0:
+                            break
+                        buf += chunk_view[:n]
+
+                        start = 0
+                        while True:
+                            idx = buf.find(b"\n", start)
+                            if idx < 0:
+                                break
+                            _handle_line(bytes(buf[start:idx]))
+                            start = idx + 1
+                        del buf[:start]
+                except KeyboardInterrupt:
+                    logger.info("Interrupted by user; closing connection")
 
         except ConnectionRefusedError as e:
             logger.error(f"Connection refused: {e}; retrying in 5 seconds...")
@@ -82,5 +140,8 @@ def main():
 
 
 if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level="DEBUG" if _TRACE else "INFO")
+
     threading.Thread(target=main, daemon=True).start()
     viz.run()
@@ -1,11 +1,25 @@
+import array
+import asyncio
+import itertools
 import math
+import os
 import socket
 import threading
 import time
-from typing import Dict, Mapping, Sequence, Optional, Tuple
+from collections import deque
+from typing import Deque, List, Mapping, Sequence, Optional, Set, Tuple
 
 # NOTE: there is a demo method at the bottom of this file if you want to quickly try it
 
+# Keep each batched send within a single TCP segment on a typical Ethernet link
+_MAX_BATCH_BYTES = 1448
+
+# Set ENABLE_WIRE_TRACE=1 to print every broadcast frame (read once at import)
+_TRACE = bool(os.environ.get("ENABLE_WIRE_TRACE"))
+
+# Stop queueing frames for a client once this much unsent data is waiting on it
+_MAX_CLIENT_BACKLOG = 64 * 1024
+
 
 class AngleStreamingServer:
     """
@@ -27,6 +41,9 @@ class AngleStreamingServer:
     The server will continuously send lines of the form:
 
         t,jointKey:x:y:z,jointKey:x:y:z,...
+
+    A new line is produced every send_interval seconds. Set flush_interval to a value larger
+    than send_interval to batch several lines into one send (at the cost of that much latency).
     """
 
     def __init__(
@@ -35,18 +52,39 @@ class AngleStreamingServer:
         host: str = "127.0.0.1",
         port: int = 5001,
         send_interval: float = 0.05,
+        flush_interval: float = 0.0,
     ):
         self.host = host
         self.port = port
         self.send_interval = send_interval
-
-        self._lock = threading.Lock()
-        self._joint_angles: Dict[str, Sequence[float]] = {
-            k: [0.0, 0.0, 0.0] for k in joint_keys
-        }
+        self.flush_interval = max(send_interval, flush_interval)
+        # send_interval=0 streams as fast as possible; there's no tick length to batch against
+        self._frames_per_flush = (
+            max(1, round(self.flush_interval / send_interval)) if send_interval > 0 else 1
+        )
+
+        self._joint_keys: List[str] = list(dict.fromkeys(joint_keys))
+        self._expected_keys = frozenset(self._joint_keys)
+
+        # Flat x, y, z doubles for every joint in _joint_keys order. Replaced wholesale (never
+        # mutated) on update, so readers can grab it without a lock
+        self._angles = array.array("d", bytes(8 * 3 * len(self._joint_keys)))
+
+        # The joint set is fixed, so build the wire format once and fill it with raw floats per send
+        # (as ASCII bytes, so frames never need encoding)
+        self._fmt_body = (
+            ",".join(f"{k.replace('%', '%%')}:%.4f:%.4f:%.4f" for k in self._joint_keys)
+            + "\n"
+        ).encode("ascii")
+        # Formatted joint fields for the last snapshot seen, reused until the angles change
+        self._cached_angles: Optional[array.array] = None
+        self._cached_body = b""
 
         self._running = False
-        self._server_sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._client_tasks: Set[asyncio.Task] = set()
 
     # --- API ---
 
@@ -57,96 +95,172 @@ class AngleStreamingServer:
         joint_angles should map each joint name to a list of [x, y, z] angles.
         """
 
-        if not isinstance(joint_angles, Mapping):
-            raise TypeError("joint_angles must be a mapping of joint name to [x, y, z]")
+        try:
+            given_keys = joint_angles.keys()
+        except AttributeError:
+            raise TypeError("joint_angles must be a mapping of joint name to [x, y, z]") from None
+
+        if not self._expected_keys <= given_keys:
+            missing = next(k for k in self._joint_keys if k not in given_keys)
+            raise ValueError(f"Missing joint '{missing}' in joint_angles")
+
+        values = [joint_angles[k] for k in self._joint_keys]
+        if any(len(v) != 3 for v in values):
+            bad = next(k for k, v in zip(self._joint_keys, values) if len(v) != 3)
+            raise ValueError(f"Joint '{bad}' must have exactly 3 values")
 
-        new_payload: Dict[str, Sequence[float]] = {}
-        for key in self._joint_angles.keys():
-            if key not in joint_angles:
-                raise ValueError(f"Missing joint '{key}' in joint_angles")
-            values = joint_angles[key]
-            if len(values) != 3:
-                raise ValueError(f"Joint '{key}' must have exactly 3 values")
-            new_payload[key] = [float(v) for v in values]
+        new_angles = array.array("d", itertools.chain.from_iterable(values))
 
-        with self._lock:
-            self._joint_angles = new_payload
+        # A single reference rebind, which is atomic in CPython
+        self._angles = new_angles
 
     def serve_forever(self) -> None:
         """
         Start listening for clients and stream the latest angles until stopped.
 
-        This method blocks; typically you run it in a background thread. See the demo() method for an example.
+        All clients are served from a single asyncio event loop. This method blocks; typically
+        you run it in a background thread. See the demo() method for an example.
         """
         self._running = True
-
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            self._server_sock = s
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.bind((self.host, self.port))
-            s.listen()
-            print(f"[server] Listening on {self.host}:{self.port}")
-
-            while self._running:
-                try:
-                    conn, addr = s.accept()
-                except OSError:
-                    # Socket closed during stop()
-                    break
-
-                thread = threading.Thread(
-                    target=self._handle_client,
-                    args=(conn, addr),
-                    daemon=True,
-                )
-                thread.start()
-
+        asyncio.run(self._serve())
         print("[server] Server stopped")
 
     def stop(self) -> None:
         """Stop accepting new clients and stop streaming."""
         self._running = False
-        if self._server_sock is not None:
+        if self._loop is not None and self._stopped is not None:
             try:
-                self._server_sock.close()
-            except OSError:
+                self._loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                # Event loop already closed
                 pass
 
     # --- Helpers ---
 
-    def _snapshot_angles(self) -> Dict[str, Sequence[float]]:
-        with self._lock:
-            return {k: list(v) for k, v in self._joint_angles.items()}
-
-    @staticmethod
-    def _format_msg(t: float, joint_angles: Dict[str, Sequence[float]]) -> bytes:
-        parts = [f"{t:.3f}"]
-        for joint in joint_angles.keys():
-            x, y, z = joint_angles[joint]
-            parts.append(f"{joint}:{x:.4f}:{y:.4f}:{z:.4f}")
-        return (",".join(parts) + "\n").encode("utf-8")
-
-    def _handle_client(self, conn: socket.socket, addr: Tuple[str, int]) -> None:
-        """Continuously send the latest angles to the connected client until it disconnects."""
+    def _snapshot_angles(self) -> array.array:
+        # The returned array is shared, treat it as read-only
+        return self._angles
+
+    def _format_msg(self, t: float, angles: array.array) -> bytes:
+        # Snapshots are immutable, so an unchanged reference means the float fields are too
+        if angles is not self._cached_angles:
+            self._cached_body = self._fmt_body % tuple(angles)
+            self._cached_angles = angles
+        return b"%.3f," % t + self._cached_body
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+
+        server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, reuse_address=True
+        )
+        print(f"[server] Listening on {self.host}:{self.port}")
+
+        async with server:
+            producer = asyncio.create_task(self._broadcast())
+            if self._running:
+                await self._stopped.wait()
+            await producer
+
+            # Closing the writers ends each client's read loop so they can clean up. This has to
+            # happen before leaving the block: on Python 3.12.1+ the server's wait_closed() waits
+            # for every open connection to close
+            for writer in tuple(self._clients):
+                writer.close()
+            if self._client_tasks:
+                await asyncio.gather(*self._client_tasks, return_exceptions=True)
+
+    async def _broadcast(self) -> None:
+        """Format the latest angles once per tick and push the same bytes to every client."""
+        # Bind everything the tick touches up front; this loop runs for the server's lifetime
+        loop = asyncio.get_running_loop()
+        clients = self._clients
+        snapshot = self._snapshot_angles
+        format_msg = self._format_msg
+        write_to_clients = self._write_to_clients
+        interval = self.send_interval
+        frames_per_flush = self._frames_per_flush
+
+        t = 0.0
+        pending: Deque[bytes] = deque()
+        pending_bytes = 0
+        next_tick = loop.time()
+        while self._running:
+            if clients:
+                msg = format_msg(t, snapshot())
+
+                if pending and pending_bytes + len(msg) > _MAX_BATCH_BYTES:
+                    write_to_clients(pending)
+                    pending.clear()
+                    pending_bytes = 0
+
+                pending.append(msg)
+                pending_bytes += len(msg)
+                if _TRACE:
+                    print(f"[server] queued for {len(clients)} client(s): {msg!r}")
+
+                if len(pending) >= frames_per_flush:
+                    write_to_clients(pending)
+                    pending.clear()
+                    pending_bytes = 0
+            elif pending:
+                # Nobody left to receive the partial batch
+                pending.clear()
+                pending_bytes = 0
+
+            t += interval
+            # Sleep to the next tick deadline so formatting/sending time doesn't add drift
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0.0:
+                # Fell behind (e.g. the process was suspended); resync instead of bursting
+                next_tick = loop.time()
+                delay = 0.0
+            await asyncio.sleep(delay)
+
+    def _write_to_clients(self, frames: Deque[bytes]) -> None:
+        for writer in tuple(self._clients):
+            if writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > _MAX_CLIENT_BACKLOG:
+                # Client isn't keeping up; drop frames rather than queue up stale poses
+                continue
+            # writelines hands the whole batch to the transport in one vectored send
+            writer.writelines(frames)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Register the connected client for broadcasts and wait for it to disconnect."""
+        addr: Tuple[str, int] = writer.get_extra_info("peername")
         print(f"[server] Client connected from {addr}")
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # Frames are tiny and batching is done explicitly, so don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        self._clients.add(writer)
         try:
-            with conn:
-                t = 0.0
-                while self._running:
-                    joint_angles = self._snapshot_angles()
-                    msg = self._format_msg(t, joint_angles)
-
-                    conn.sendall(msg)
-                    print(f"[server] sent to {addr}: {msg!r}")
-
-                    t += self.send_interval
-                    time.sleep(self.send_interval)
+            # Clients never send anything, so a read only returns once the connection closes
+            while await reader.read(1024):
+                pass
 
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
             print(f"[server] Connection to {addr} closed: {e}")
         finally:
+            self._clients.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
+            self._client_tasks.discard(task)
             print(f"[server] Client {addr} disconnected")
 
+
 def demo():
     """
     Runs a demo AngleStreamingServer that does a lil dancy dance
@@ -168,31 +282,39 @@ def demo():
 
     print("[server] AngleStreamingServer started; generating demo angles...")
 
-    start = time.time()
-    try:
-        while True:
-            elapsed = time.time() - start
-            beat = 2 * math.pi * 0.6 * elapsed  # primary tempo ~0.6 Hz
+    # Every motion below runs at a multiple of 0.06 Hz, so the whole dance repeats every
+    # 50/3 s; three repeats (50 s) land exactly on the 0.1 s producer tick
+    dt = 0.1
+    period_steps = 500
+    frames = []
+    for step in range(period_steps):
+        beat = 2 * math.pi * 0.6 * step * dt  # primary tempo ~0.6 Hz
+
+        payload = {}
+        arm_swing = 35.0 * math.sin(beat)  # side-to-side
+        arm_raise = 25.0 * math.sin(beat * 0.5)  # lift/lower
+        payload["right_shoulder"] = [arm_swing, arm_raise, 0.0]
+        payload["left_shoulder"] = [-arm_swing, -arm_raise, 0.0]
 
-            payload = {}
-            arm_swing = 35.0 * math.sin(beat)  # side-to-side
-            arm_raise = 25.0 * math.sin(beat * 0.5)  # lift/lower
-            payload["right_shoulder"] = [arm_swing, arm_raise, 0.0]
-            payload["left_shoulder"] = [-arm_swing, -arm_raise, 0.0]
+        torso_twist = 15.0 * math.sin(beat * 1.2)  # light torso twist
+        payload["spine1"] = [0.0, torso_twist, 0.0]
 
-            torso_twist = 15.0 * math.sin(beat * 1.2)  # light torso twist
-            payload["spine1"] = [0.0, torso_twist, 0.0]
+        leg_kick = 20.0 * math.sin(beat + math.pi / 2)  # offset from arms
+        payload["left_hip"] = [leg_kick, 0.0, 0.0]
+        payload["right_hip"] = [-leg_kick, 0.0, 0.0]
 
-            leg_kick = 20.0 * math.sin(beat + math.pi / 2)  # offset from arms
-            payload["left_hip"] = [leg_kick, 0.0, 0.0]
-            payload["right_hip"] = [-leg_kick, 0.0, 0.0]
+        knee_bounce = 10.0 * math.sin(beat * 2.0)  # faster bounce for variety
+        payload["left_knee"] = [knee_bounce, 0.0, 0.0]
+        payload["right_knee"] = [-knee_bounce, 0.0, 0.0]
 
-            knee_bounce = 10.0 * math.sin(beat * 2.0)  # faster bounce for variety
-            payload["left_knee"] = [knee_bounce, 0.0, 0.0]
-            payload["right_knee"] = [-knee_bounce, 0.0, 0.0]
+        frames.append(payload)
 
-            server.update_joint_angles(payload)
-            time.sleep(0.1)
+    tick = 0
+    try:
+        while True:
+            server.update_joint_angles(frames[tick % period_steps])
+            tick += 1
+            time.sleep(dt)
 
     except KeyboardInterrupt:
         print("[server] Dance angle producer interrupted")